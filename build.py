@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""Build a wheel with the scalar kernels compiled ahead of time by mypyc.
+
+The default build (``pip wheel .`` or ``poetry build``) yields a pure-Python
+wheel. This script is the explicit opt-in for a platform-specific wheel in
+which the compiled extension shadows ``gcat/_kernels.py``. It requires mypy,
+setuptools and wheel (and tomli before Python 3.11), and writes the wheel to
+``dist/``:
+
+    python build.py
+
+The package metadata are read from ``pyproject.toml``.
+"""
+
+import sys
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+
+def _requirement(name, spec):
+    """Convert a Poetry dependency into a PEP 508 requirement."""
+    version = spec["version"] if isinstance(spec, dict) else spec
+    return name + version
+
+
+def main():
+    """Build the compiled wheel."""
+    from mypyc.build import mypycify
+    from setuptools import setup
+
+    with open("pyproject.toml", "rb") as f:
+        poetry = tomllib.load(f)["tool"]["poetry"]
+
+    dependencies = dict(poetry["dependencies"])
+    python_requires = dependencies.pop("python")
+
+    setup(
+        name=poetry["name"],
+        version=poetry["version"],
+        description=poetry["description"],
+        license=poetry["license"],
+        url=poetry["repository"],
+        packages=["gcat"],
+        python_requires=python_requires,
+        extras_require={
+            extra: [_requirement(name, dependencies[name]) for name in names]
+            for extra, names in poetry.get("extras", {}).items()
+        },
+        ext_modules=mypycify(["gcat/_kernels.py"]),
+        script_args=["bdist_wheel"] + sys.argv[1:],
+    )
+
+
+if __name__ == "__main__":
+    main()
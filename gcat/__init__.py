@@ -5,10 +5,13 @@
 __version__ = "1.0.0"
 
 from .convergence import (
+    GCIResult,
     apparent_order_of_convergence,
     asymptotic_ratio,
+    gci_all,
     gci_coarse,
     gci_fine,
     relative_error,
+    representative_size,
     richardson_extrapolation,
 )
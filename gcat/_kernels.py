@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""Provide the scalar kernels of the apparent order of convergence.
+
+The kernels are kept apart from ``gcat.convergence`` so that they can be
+compiled ahead of time with mypyc when building wheels (see ``build.py``).
+Otherwise, ``gcat.convergence`` compiles them with Numba if available, and
+runs them as plain Python as a last resort. Thus, this module must stick to
+the subset of Python supported by both mypyc and Numba's nopython mode.
+"""
+
+import math
+
+# Newton's method either converges within a handful of iterations or not
+# at all, in which case the fixed-point iteration takes over.
+NEWTON_MAX_ITER = 50
+
+# Initial guesses below this value are replaced by one, as r^p - s cancels
+# out near zero and Newton's steps become vanishingly small.
+MIN_INITIAL_GUESS = 1e-3
+
+# Largest |p*ln(r)| for which r^p is evaluated. Beyond exp(709), r^p raises
+# OverflowError in plain Python but silently yields inf with Numba.
+MAX_EXPONENT = 700.0
+
+
+def apparent_order_kernel(
+    r21: float,
+    r32: float,
+    epsilon_ratio: float,
+    s: float,
+    omega: float,
+    tol: float,
+    max_iter: float,
+    max_residual: float,
+) -> float:
+    """Solve for the apparent order of convergence of a single triplet.
+
+    The apparent order of convergence is the root of
+
+        F(p) = p*ln(r21) - |ln|e32/e21| + q(p)|                 (1)
+
+    with q(p) = ln((r21^p - s) / (r32^p - s)), which is found with
+    Newton's method using the analytic derivative of F. The closed-form
+    solution for a constant refinement factor [3] is the initial guess.
+    Should Newton's method fail, the relaxed fixed-point iteration of [1]
+    is used instead.
+
+    References are those of ``gcat.convergence``.
+    """
+    # Numba returns NaN or -inf where math.log raises, so the domain is
+    # checked here for every backend to fail alike.
+    if not (r21 > 0 and r32 > 0 and epsilon_ratio != 0):
+        raise ValueError("math domain error")
+
+    # Loop invariants
+    log_r21 = math.log(r21)
+    log_r32 = math.log(r32)
+    log_epsilon_ratio = math.log(abs(epsilon_ratio))
+
+    max_log_r = max(abs(log_r21), abs(log_r32))
+
+    p0 = abs(log_epsilon_ratio) / log_r21
+
+    if not p0 > MIN_INITIAL_GUESS:
+        p0 = 1.0
+
+    p = p0
+
+    for _ in range(NEWTON_MAX_ITER):
+        # Leave the overflow to the fixed-point iteration, which gives up
+        if not p * max_log_r < MAX_EXPONENT:
+            break
+
+        rp21 = r21**p
+        rp32 = r32**p
+        ratio = (rp21 - s) / (rp32 - s)
+
+        if not ratio > 0:
+            break
+
+        g = log_epsilon_ratio + math.log(ratio)
+        dg = rp21 * log_r21 / (rp21 - s) - rp32 * log_r32 / (rp32 - s)
+        df = log_r21 - math.copysign(1.0, g) * dg
+
+        # Past a maximum of F, Newton's method may jump to a root other
+        # than the one found by the fixed-point iteration.
+        if not df > 0:
+            break
+
+        f = p * log_r21 - abs(g)
+        step = f / df
+        p -= step
+
+        if not p > 0:
+            break
+
+        # A small step alone may stem from a large derivative, so F must
+        # be small as well (relative to the fixed-point residual).
+        scale = tol * max(1.0, p)
+        if abs(step) <= scale and abs(f) <= scale * log_r21:
+            return p
+
+    return fixed_point_kernel(
+        r21,
+        r32,
+        log_r21,
+        log_epsilon_ratio,
+        s,
+        p0,
+        omega,
+        tol,
+        max_iter,
+        max_residual,
+    )
+
+
+def fixed_point_kernel(
+    r21: float,
+    r32: float,
+    log_r21: float,
+    log_epsilon_ratio: float,
+    s: float,
+    p: float,
+    omega: float,
+    tol: float,
+    max_iter: float,
+    max_residual: float,
+) -> float:
+    """Iterate the apparent order of convergence as a fixed point [1]."""
+    inv_log_r21 = 1.0 / log_r21
+    max_log_r = max(abs(log_r21), abs(math.log(r32)))
+
+    for _ in range(int(max_iter) + 1):
+        # Update p1 as p
+        p1 = p
+
+        # Give up before r^p overflows, which also catches a non-finite p
+        if not abs(p1) * max_log_r < MAX_EXPONENT:
+            break
+
+        # Calculate q
+        ratio = (r21**p1 - s) / (r32**p1 - s)
+
+        if not ratio > 0:
+            break
+
+        q = math.log(ratio)
+
+        # Calculate p2
+        p2 = inv_log_r21 * abs(log_epsilon_ratio + q)
+
+        # Update p using a relaxation factor 'omega' that blends p1 and p2
+        p = (1 - omega) * p1 + omega * p2
+
+        # Calculate the residual of the current iteration
+        residual = p - p1
+
+        # Stop as soon as the update is small relative to p
+        if abs(residual) <= tol * max(1.0, abs(p1)):
+            return p
+
+        # If it all goes wrong, stop it!
+        if residual > max_residual:
+            break
+
+    raise RuntimeError(
+        "Could not find the apparent order of convergence. "
+        "The iterative process did not converge."
+    )
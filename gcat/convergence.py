@@ -6,6 +6,19 @@ The naming convention in this module follows the nomenclature presented in
 [1, 2]. References used in docstrings are presented in the ``References``
 section below.
 
+Besides scalars, every function accepts NumPy arrays, which are broadcast
+against each other. This allows, e.g., computing the GCI at every cell of a
+field at once instead of looping over the cells in Python.
+
+Degenerate inputs are handled differently on each path. For scalars, they
+raise ``ZeroDivisionError`` or ``ValueError``, and
+``apparent_order_of_convergence`` raises ``RuntimeError`` if it does not
+converge, e.g., because r^p overflows. This holds whether its kernels run
+as plain Python or are compiled with Numba or mypyc. For arrays, they
+only affect the elements concerned, which are set to NaN by
+``apparent_order_of_convergence``, and to NaN or infinity (with NumPy's
+usual warnings) by the other functions.
+
 References
 ----------
 [1] I. B. Celik, U. Ghia, P. J. Roache, C. J. Freitas, H. Coleman, and P.
@@ -22,7 +35,60 @@ References
     (accessed Oct. 22, 2020).
 """
 
+import functools
 import math
+import numbers
+from typing import NamedTuple
+
+from . import _kernels
+
+# Scalar kernel of the apparent order of convergence, see `_jit`
+_apparent_order_kernel = _kernels.apparent_order_kernel
+
+# LLVM fast-math flags for the Numba kernels. The kernels rely on failing
+# comparisons to detect NaNs and infinities, so 'nnan' and 'ninf' are left
+# out.
+_FASTMATH = {"contract", "arcp", "reassoc"}
+
+# Whether the scalar kernels went through `_jit` already. Numba takes
+# hundreds of milliseconds to import, so it is only loaded on first use.
+_jitted = False
+
+
+def representative_size(
+    total_size: float, num_elements: float, num_dimensions: int = 3
+) -> float:
+    """Calculate the representative grid size.
+
+    The representative grid size of a grid with N elements is defined as
+    [1]:
+
+        h = (V / N)^(1/D)                                       (1)
+
+    where V is the total size of the domain (volume in 3D, area in 2D) and D
+    is the number of spatial dimensions.
+
+    Parameters
+    ----------
+    total_size : float or numpy.ndarray
+        Total size of the computational domain.
+    num_elements : float or numpy.ndarray
+        Number of elements of the grid. An array yields the representative
+        size of each grid at once.
+    num_dimensions : int, optional
+        Number of spatial dimensions.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The representative grid size.
+
+    Raises
+    ------
+    ZeroDivisionError
+        Either `num_elements` or `num_dimensions` is zero.
+    """
+    return (total_size / num_elements) ** (1.0 / num_dimensions)
 
 
 def apparent_order_of_convergence(
@@ -41,46 +107,75 @@ def apparent_order_of_convergence(
 
     Parameters
     ----------
-    h1 : float
+    h1 : float or array_like
         Representative grid size for the 1st grid (fine).
-    h2 : float
+    h2 : float or array_like
         Representative grid size for the 2nd grid (medium).
-    h3 : float
+    h3 : float or array_like
         Representative grid size for the 3rd grid (coarse).
-    f1 : float
+    f1 : float or array_like
         Solution on the 1st grid.
-    f2 : float
+    f2 : float or array_like
         Solution on the 2nd grid.
-    f3 : float
+    f3 : float or array_like
         Solution on the 3rd grid.
     min_ref_factor : float, optional
         Minimum refinement factor allowed.
     omega : float, optional
-        Relaxation factor used in the bleding fuction during the iterative
-        process. Should be between zero and one.
+        Relaxation factor used in the bleding fuction of the fixed-point
+        iteration. Should be between zero and one. Only used if Newton's
+        method fails to converge.
     tol : float
-        Maximum tolerance for the iterative process.
+        Maximum tolerance for the iterative process. It is relative to the
+        apparent order of convergence when the latter is larger than one.
     max_iter : int
-        Maximum number of iterations. Prevents an infinite interation loop.
+        Maximum number of iterations of the fixed-point iteration. Prevents
+        an infinite interation loop.
     max_residual : float
-        Maximum residual for the interative process.
+        Maximum residual for the fixed-point iteration.
 
     Returns
     -------
-    float
-        The apparent order of convergence.
+    float or numpy.ndarray
+        The apparent order of convergence. If any of the grid sizes or
+        solutions is an array, the inputs are broadcast against each other
+        and the order is computed element-wise (requires NumPy). Elements
+        that are degenerate or do not converge are set to NaN.
+        Results for scalar inputs are memoized; call
+        ``apparent_order_of_convergence.cache_clear()`` to discard them.
 
     Raises
     ------
     RuntimeError
         The iterative process did not converge before reaching either the
-        maximum number of iterations or the maximum residual.
+        maximum number of iterations or the maximum residual, or an
+        iterate left the domain of r^p or of the logarithm (scalar inputs
+        only).
     ValueError
         `omega` is out of bounds
     """
     if omega < 0 or omega > 1:
         raise ValueError("Relaxation factor `omega` out of bound.")
 
+    if not all(isinstance(x, numbers.Real) for x in (h1, h2, h3, f1, f2, f3)):
+        return _apparent_order_of_convergence_array(
+            h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+        )
+
+    return _apparent_order_of_convergence_scalar(
+        h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _apparent_order_of_convergence_scalar(
+    h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+):
+    """Calculate the apparent order of convergence for scalar inputs.
+
+    The results are memoized, as the same triplets tend to recur in
+    parameter sweeps and sensitivity studies.
+    """
     # Compute the grid refinement factor
     r21 = h2 / h1
     r32 = h3 / h2
@@ -89,44 +184,219 @@ def apparent_order_of_convergence(
     epsilon32 = f3 - f2
     epsilon_ratio = epsilon32 / epsilon21
 
+    # With a constant refinement factor, q vanishes and the initial guess
+    # of the iterative process is already the solution [3].
+    if math.isclose(r21, r32, rel_tol=1e-12):
+        return abs(math.log(abs(epsilon_ratio))) / math.log(r21)
+
     # Get the signal of 'epsilon_ratio'
-    s = 1 - 2 * (epsilon_ratio < 0)
+    s = math.copysign(1.0, epsilon_ratio)
+
+    if not _jitted:
+        _jit()
+
+    return _apparent_order_kernel(
+        float(r21),
+        float(r32),
+        float(epsilon_ratio),
+        s,
+        float(omega),
+        float(tol),
+        float(max_iter),
+        float(max_residual),
+    )
+
+
+# Let long-running sessions manage the memoized scalar results
+_cache = _apparent_order_of_convergence_scalar
+apparent_order_of_convergence.cache_clear = _cache.cache_clear  # type: ignore
+apparent_order_of_convergence.cache_info = _cache.cache_info  # type: ignore
+del _cache
+
+
+def _jit():
+    """Compile the scalar kernels with Numba, if needed and available."""
+    global _jitted, _apparent_order_kernel
+
+    _jitted = True
+
+    # Already compiled ahead of time by mypyc
+    if not _kernels.__file__.endswith(".py"):
+        return
+
+    try:
+        from numba import njit
+    except ImportError:
+        return
+
+    # The callee must be compiled first, so that Numba resolves it as a
+    # compiled function when typing the caller.
+    _kernels.fixed_point_kernel = njit(cache=True, fastmath=_FASTMATH)(
+        _kernels.fixed_point_kernel
+    )
+    _apparent_order_kernel = njit(cache=True, fastmath=_FASTMATH)(
+        _kernels.apparent_order_kernel
+    )
+
+
+def _apparent_order_of_convergence_array(
+    h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+):
+    """Calculate the apparent order of convergence element-wise.
+
+    Vectorized counterpart of ``apparent_order_of_convergence``. All the
+    elements are iterated in lockstep, so that the loop runs over NumPy
+    ufuncs instead of the Python interpreter. Requires NumPy.
+
+    Unlike the scalar path, degenerate or non-converging elements do not
+    raise but yield NaN, so that they do not spoil a whole field.
+    """
+    import numpy as np
 
-    # Initial values for the iteration loop
-    residual = 0
-    iterations = 0
-    p = (1.0 / math.log(r21)) * abs(math.log(abs(epsilon_ratio)))
+    h1, h2, h3, f1, f2, f3 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (h1, h2, h3, f1, f2, f3))
+    )
 
-    while abs(residual) > tol:
-        # If it all goes wrong, stop it!
-        if iterations > max_iter or residual > max_residual:
-            raise RuntimeError(
-                "Could not find the apparent order of convergence. "
-                "The iterative process did not converge."
-            )
+    with np.errstate(all="ignore"):
+        p = _apparent_order_array(
+            h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+        )
 
-        # Update p1 as p
-        p1 = p
+    # Degenerate elements, e.g., f3 == f2, yield NaN instead of raising
+    return np.where(np.isfinite(p), p, np.nan)
 
-        # Calculate q
-        q = math.log((r21**p1 - s) / (r32**p1 - s))
 
-        # Calculate p2
-        p2 = (1.0 / math.log(r21)) * abs(math.log(abs(epsilon_ratio)) + q)
+def _apparent_order_array(
+    h1, h2, h3, f1, f2, f3, omega, tol, max_iter, max_residual
+):
+    """Solve for the apparent order of convergence of broadcast arrays."""
+    import numpy as np
 
-        # Update p using a relaxation factor 'omega' that blends p1 and p2
-        p = (1 - omega) * p1 + omega * p2
+    # Compute the grid refinement factor
+    r21 = h2 / h1
+    r32 = h3 / h2
 
-        # Calculate the residual of the current iteration
-        residual = p - p1
+    epsilon_ratio = (f3 - f2) / (f2 - f1)
 
-        # Increase the interation number
-        iterations += 1
+    # Get the signal of 'epsilon_ratio'
+    s = np.copysign(1.0, epsilon_ratio)
+
+    # Loop invariants
+    log_r21 = np.log(r21)
+    log_r32 = np.log(r32)
+    log_epsilon_ratio = np.log(np.abs(epsilon_ratio))
+
+    p0 = np.abs(log_epsilon_ratio) / log_r21
+
+    # With a constant refinement factor, q vanishes and the initial guess
+    # is already the solution [3].
+    uniform = np.isclose(r21, r32, rtol=1e-12, atol=0.0)
+
+    if np.all(uniform):
+        return p0
+
+    p0 = np.where(uniform | (p0 > _kernels.MIN_INITIAL_GUESS), p0, 1.0)
+
+    # Newton's method; elements that fail are frozen and left to the
+    # fixed-point iteration below.
+    p = p0.copy()
+    failed = np.zeros(p.shape, dtype=bool)
+    converged = uniform
+
+    for _ in range(_kernels.NEWTON_MAX_ITER):
+        rp21 = r21**p
+        rp32 = r32**p
+
+        g = log_epsilon_ratio + np.log((rp21 - s) / (rp32 - s))
+        dg = rp21 * log_r21 / (rp21 - s) - rp32 * log_r32 / (rp32 - s)
+        df = log_r21 - np.copysign(1.0, g) * dg
+
+        # Elements that converged are frozen, so that their result does not
+        # depend on how long the others take.
+        failed |= ~converged & ~(df > 0)
+        f = p * log_r21 - np.abs(g)
+        step = np.where(failed | converged, 0.0, f / df)
+        p = p - step
+        failed |= ~converged & ~(p > 0)
+
+        scale = tol * np.maximum(1.0, p)
+        converged = converged | (
+            ~failed & (np.abs(step) <= scale) & (np.abs(f) <= scale * log_r21)
+        )
+        if np.all(converged | failed):
+            break
+
+    failed = ~converged
+
+    if np.any(failed):
+        p[failed] = _fixed_point_array(
+            r21[failed],
+            r32[failed],
+            log_r21[failed],
+            log_epsilon_ratio[failed],
+            s[failed],
+            p0[failed],
+            omega,
+            tol,
+            max_iter,
+            max_residual,
+        )
 
-    # Return the resulting value of p
     return p
 
 
+def _fixed_point_array(
+    r21,
+    r32,
+    log_r21,
+    log_epsilon_ratio,
+    s,
+    p,
+    omega,
+    tol,
+    max_iter,
+    max_residual,
+):
+    """Iterate the apparent order of convergence element-wise [1].
+
+    Elements drop out of the iteration as soon as they converge or stop
+    being finite. Those that do not converge are set to NaN, so that a
+    single degenerate element does not fail the whole array.
+    """
+    import numpy as np
+
+    result = np.full(p.shape, np.nan)
+
+    # Indices of the elements still being iterated
+    index = np.flatnonzero(np.isfinite(p))
+    r21, r32, log_r21, log_epsilon_ratio, s, p = (
+        x[index] for x in (r21, r32, log_r21, log_epsilon_ratio, s, p)
+    )
+    inv_log_r21 = 1.0 / log_r21
+
+    for _ in range(int(max_iter) + 1):
+        if index.size == 0:
+            break
+
+        p1 = p
+        q = np.log((r21**p1 - s) / (r32**p1 - s))
+        p2 = inv_log_r21 * np.abs(log_epsilon_ratio + q)
+        p = (1 - omega) * p1 + omega * p2
+        residual = p - p1
+
+        done = np.abs(residual) <= tol * np.maximum(1.0, np.abs(p1))
+        result[index[done]] = p[done]
+
+        # If it all goes wrong, stop it!
+        keep = ~done & np.isfinite(p) & ~(residual > max_residual)
+        index, r21, r32, inv_log_r21, log_epsilon_ratio, s, p = (
+            x[keep]
+            for x in (index, r21, r32, inv_log_r21, log_epsilon_ratio, s, p)
+        )
+
+    return result
+
+
 def richardson_extrapolation(
     h1: float, h2: float, f1: float, f2: float, p: float
 ) -> float:
@@ -169,20 +439,20 @@ def richardson_extrapolation(
 
     Parameters
     ----------
-    h1 : float
+    h1 : float or numpy.ndarray
         Representative grid size for the 1st grid (finer).
-    h2 : float
+    h2 : float or numpy.ndarray
         Representative grid size for the 2nd grid (coarser).
-    f1 : float
+    f1 : float or numpy.ndarray
         Solution on the 1st grid.
-    f2 : float
+    f2 : float or numpy.ndarray
         Solution on the 2nd grid.
-    p : float
+    p : float or numpy.ndarray
         Apparent order of convergence.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The continuum solution on a zero-spacing grid.
 
     Raises
@@ -195,9 +465,10 @@ def richardson_extrapolation(
     """
     # Compute the grid refinement factor
     r21 = h2 / h1
+    rp = r21**p
 
     # Compute the continue value at zero grid spacing
-    f_exact = ((r21**p) * f1 - f2) / (r21**p - 1.0)
+    f_exact = (rp * f1 - f2) / (rp - 1.0)
 
     return f_exact
 
@@ -207,20 +478,20 @@ def relative_error(f1: float, f2: float) -> float:
 
     Parameters
     ----------
-    f1 : float
+    f1 : float or numpy.ndarray
         The reference value.
-    f2 : float
+    f2 : float or numpy.ndarray
         The value being compared.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The relative error.
 
     Raises
     ------
     ZeroDivisionError
-        `f1` is zero.
+        `f1` is zero (scalar inputs only).
     """
     return abs((f1 - f2) / f1)
 
@@ -242,23 +513,23 @@ def gci_fine(
 
     Parameters
     ----------
-    f1 : float
+    f1 : float or numpy.ndarray
         The solution on the fine grid.
-    f2 : float
+    f2 : float or numpy.ndarray
         The solution on the coarse grid.
-    r21 : float
+    r21 : float or numpy.ndarray
         The refinement factor between the coarse and the fine grid.
-    p : float
+    p : float or numpy.ndarray
         The apparent order of convergence.
     safety_factor : float, optional
         The safety factor.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The estimated error for the fine-grid solution.
     """
-    return (safety_factor * relative_error(f1, f2)) / (r21**p - 1.0)
+    return _gci(relative_error(f1, f2), r21**p, safety_factor)
 
 
 def gci_coarse(
@@ -280,24 +551,30 @@ def gci_coarse(
 
     Parameters
     ----------
-    f1 : float
+    f1 : float or numpy.ndarray
         The solution on the fine grid.
-    f2 : float
+    f2 : float or numpy.ndarray
         The solution on the coarse grid.
-    r21 : float
+    r21 : float or numpy.ndarray
         The refinement factor between the coarse and the fine grid.
-    p : float
+    p : float or numpy.ndarray
         The apparent order of convergence.
     safety_factor : float, optional
         The safety factor.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The estimated error for the coarse-grid solution.
 
     """
-    return gci_fine(f1, f2, r21, p, safety_factor) * (r21**p)
+    rp = r21**p
+    return _gci(relative_error(f1, f2), rp, safety_factor) * rp
+
+
+def _gci(rel_err, rp, safety_factor):
+    """Calculate the fine-grid error estimator given a precomputed r^p."""
+    return (safety_factor * rel_err) / (rp - 1.0)
 
 
 def asymptotic_ratio(
@@ -310,16 +587,102 @@ def asymptotic_ratio(
 
     Parameters
     ----------
-    gci21 : float
-    gci32 : float
-    r21 : float
+    gci21 : float or numpy.ndarray
+    gci32 : float or numpy.ndarray
+    r21 : float or numpy.ndarray
         The refinement factor between the coarse and the fine grid.
-    p : float
+    p : float or numpy.ndarray
         The apparent order of convergence.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The asymptotic ratio of convergence.
     """
     return r21**p * (gci21 / gci32)
+
+
+class GCIResult(NamedTuple):
+    """Outcome of a grid convergence study with three grids.
+
+    Attributes
+    ----------
+    gci21_fine : float or numpy.ndarray
+        The estimated error for the fine-grid solution (grids 1 and 2).
+    gci21_coarse : float or numpy.ndarray
+        The estimated error for the coarse-grid solution (grids 1 and 2).
+    gci32_fine : float or numpy.ndarray
+        The estimated error for the fine-grid solution (grids 2 and 3).
+    gci32_coarse : float or numpy.ndarray
+        The estimated error for the coarse-grid solution (grids 2 and 3).
+    asymptotic_ratio : float or numpy.ndarray
+        The asymptotic ratio of convergence.
+    f_exact : float or numpy.ndarray
+        The continuum solution on a zero-spacing grid, extrapolated from
+        grids 1 and 2.
+    """
+
+    gci21_fine: float
+    gci21_coarse: float
+    gci32_fine: float
+    gci32_coarse: float
+    asymptotic_ratio: float
+    f_exact: float
+
+
+def gci_all(
+    h1: float,
+    h2: float,
+    h3: float,
+    f1: float,
+    f2: float,
+    f3: float,
+    p: float,
+    safety_factor: float = 1.25,
+) -> GCIResult:
+    """Calculate all the error estimators of a three-grid study at once.
+
+    Equivalent to calling ``gci_fine``, ``gci_coarse``, ``asymptotic_ratio``
+    and ``richardson_extrapolation`` for both grid pairs, but evaluates each
+    refinement factor, r^p and relative error only once.
+
+    Parameters
+    ----------
+    h1 : float or numpy.ndarray
+        Representative grid size for the 1st grid (fine).
+    h2 : float or numpy.ndarray
+        Representative grid size for the 2nd grid (medium).
+    h3 : float or numpy.ndarray
+        Representative grid size for the 3rd grid (coarse).
+    f1 : float or numpy.ndarray
+        Solution on the 1st grid.
+    f2 : float or numpy.ndarray
+        Solution on the 2nd grid.
+    f3 : float or numpy.ndarray
+        Solution on the 3rd grid.
+    p : float or numpy.ndarray
+        The apparent order of convergence.
+    safety_factor : float, optional
+        The safety factor.
+
+    Returns
+    -------
+    GCIResult
+        The error estimators, the asymptotic ratio and the extrapolated
+        solution.
+    """
+    # Compute the grid refinement factors
+    rp21 = (h2 / h1) ** p
+    rp32 = (h3 / h2) ** p
+
+    gci21_fine = _gci(relative_error(f1, f2), rp21, safety_factor)
+    gci32_fine = _gci(relative_error(f2, f3), rp32, safety_factor)
+
+    return GCIResult(
+        gci21_fine=gci21_fine,
+        gci21_coarse=gci21_fine * rp21,
+        gci32_fine=gci32_fine,
+        gci32_coarse=gci32_fine * rp32,
+        asymptotic_ratio=rp21 * (gci21_fine / gci32_fine),
+        f_exact=(rp21 * f1 - f2) / (rp21 - 1.0),
+    )
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""Test the convergence utilities against reference implementations."""
+
+import math
+
+import pytest
+
+import gcat
+
+
+def fixed_point(h1, h2, h3, f1, f2, f3, omega=0.5, tol=1e-12):
+    """Iterate the apparent order of convergence as in [1], eq. (3)."""
+    r21 = h2 / h1
+    r32 = h3 / h2
+    epsilon_ratio = (f3 - f2) / (f2 - f1)
+    s = math.copysign(1.0, epsilon_ratio)
+
+    p = 1.0
+    for _ in range(100000):
+        q = math.log((r21**p - s) / (r32**p - s))
+        p2 = abs(math.log(abs(epsilon_ratio)) + q) / math.log(r21)
+        p, p1 = (1 - omega) * p + omega * p2, p
+        if abs(p - p1) <= tol:
+            return p
+
+    raise RuntimeError("The reference solver did not converge.")
+
+
+# Representative grid sizes and solutions from [1], table 1
+CELIK_H = tuple(
+    gcat.representative_size(1.0, n, 2) for n in (18000, 8000, 4500)
+)
+
+CASES = [
+    CELIK_H + (6.063, 5.972, 5.863),
+    CELIK_H + (10.7880, 10.7250, 10.6050),
+    # First-order data, i.e., f linear in h
+    (1.0, 1.5, 2.0, 1.0, 1.1, 1.2),
+    # Unit error ratio
+    (1.0, 1.5, 2.0, 0.0, 1.0, 2.0),
+    # Oscillatory convergence
+    (1.0, 1.3, 2.0, 1.0, 1.2, 0.5),
+]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_apparent_order_matches_fixed_point(case):
+    p = gcat.apparent_order_of_convergence(*case)
+    assert p == pytest.approx(fixed_point(*case), rel=1e-4)
+
+
+def test_apparent_order_celik_example():
+    p = gcat.apparent_order_of_convergence(*CASES[0])
+    assert p == pytest.approx(1.53, abs=5e-3)
+
+
+def test_apparent_order_first_order_data():
+    p = gcat.apparent_order_of_convergence(*CASES[2])
+    assert p == pytest.approx(1.0, rel=1e-6)
+
+
+def test_apparent_order_constant_refinement_factor():
+    p = gcat.apparent_order_of_convergence(1.0, 2.0, 4.0, 1.0, 1.1, 1.5)
+    assert p == pytest.approx(2.0)
+
+
+@pytest.fixture(params=["default", "python"])
+def kernels(request, monkeypatch):
+    """Run the scalar kernels as they are loaded, then as plain Python."""
+    if request.param == "python":
+        from gcat import _kernels, convergence
+
+        fixed_point_kernel = getattr(
+            _kernels.fixed_point_kernel, "py_func", _kernels.fixed_point_kernel
+        )
+        monkeypatch.setattr(_kernels, "fixed_point_kernel", fixed_point_kernel)
+        monkeypatch.setattr(
+            convergence,
+            "_apparent_order_kernel",
+            _kernels.apparent_order_kernel,
+        )
+        monkeypatch.setattr(convergence, "_jitted", True)
+
+    gcat.apparent_order_of_convergence.cache_clear()
+    yield request.param
+    gcat.apparent_order_of_convergence.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        # r^p overflows
+        (
+            1.0,
+            1.1620935355587638,
+            1.8781590428245798,
+            -1.1616346874848653,
+            -1.1126054810636807,
+            -1.737035409764443,
+        ),
+        # q leaves the domain of the logarithm
+        (1.0, 2.0, 1.5, 1.0, 1.5, 1.8),
+    ],
+)
+def test_apparent_order_raises_runtime_error(case, kernels):
+    with pytest.raises(RuntimeError):
+        gcat.apparent_order_of_convergence(*case)
+
+
+def test_apparent_order_zero_error_ratio(kernels):
+    with pytest.raises(ValueError):
+        gcat.apparent_order_of_convergence(1.0, 1.5, 2.0, 1.0, 1.2, 1.2)
+
+
+def test_apparent_order_array_matches_scalar():
+    np = pytest.importorskip("numpy")
+
+    expected = [gcat.apparent_order_of_convergence(*case) for case in CASES]
+    columns = [np.array(column) for column in zip(*CASES)]
+
+    p = gcat.apparent_order_of_convergence(*columns)
+    assert p == pytest.approx(expected, rel=1e-4)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_apparent_order_array_independent_of_batch(case):
+    np = pytest.importorskip("numpy")
+
+    single = gcat.apparent_order_of_convergence(*(np.array([x]) for x in case))
+    batched = gcat.apparent_order_of_convergence(
+        *(np.array([x, y]) for x, y in zip(case, CASES[0]))
+    )
+    assert single[0] == pytest.approx(batched[0], rel=1e-12)
+
+
+def test_apparent_order_array_degenerate_element():
+    np = pytest.importorskip("numpy")
+
+    f1 = np.array([1.0, 1.0, 1.0])
+    f2 = np.array([1.1, 1.1, 1.1])
+    f3 = np.array([1.2, 1.1, 1.35])
+
+    with np.errstate(all="raise"):
+        p = gcat.apparent_order_of_convergence(1.0, 1.5, 2.0, f1, f2, f3)
+
+    assert np.isnan(p[1])
+    assert p[[0, 2]] == pytest.approx(
+        [
+            fixed_point(1.0, 1.5, 2.0, 1.0, 1.1, 1.2),
+            fixed_point(1.0, 1.5, 2.0, 1.0, 1.1, 1.35),
+        ],
+        rel=1e-4,
+    )
+
+
+def estimators(h1, h2, h3, f1, f2, f3, p):
+    """Compute the outcome of ``gcat.gci_all`` one estimator at a time."""
+    r21 = h2 / h1
+    r32 = h3 / h2
+    gci21_fine = gcat.gci_fine(f1, f2, r21, p)
+    gci32_fine = gcat.gci_fine(f2, f3, r32, p)
+
+    return gcat.GCIResult(
+        gci21_fine=gci21_fine,
+        gci21_coarse=gcat.gci_coarse(f1, f2, r21, p),
+        gci32_fine=gci32_fine,
+        gci32_coarse=gcat.gci_coarse(f2, f3, r32, p),
+        asymptotic_ratio=gcat.asymptotic_ratio(gci21_fine, gci32_fine, r21, p),
+        f_exact=gcat.richardson_extrapolation(h1, h2, f1, f2, p),
+    )
+
+
+@pytest.mark.parametrize("case", CASES[:2])
+def test_gci_all_matches_estimators(case):
+    p = gcat.apparent_order_of_convergence(*case)
+
+    result = gcat.gci_all(*case, p)
+    expected = estimators(*case, p)
+
+    assert isinstance(result, gcat.GCIResult)
+    for field in gcat.GCIResult._fields:
+        assert getattr(result, field) == pytest.approx(
+            getattr(expected, field), rel=1e-12
+        )
+
+
+def test_gci_all_array_matches_estimators():
+    np = pytest.importorskip("numpy")
+
+    # Grid sizes are broadcast against the solutions of both cases
+    f1, f2, f3 = (np.array(column) for column in list(zip(*CASES[:2]))[3:])
+    p = gcat.apparent_order_of_convergence(*CELIK_H, f1, f2, f3)
+
+    result = gcat.gci_all(*CELIK_H, f1, f2, f3, p)
+    expected = estimators(*CELIK_H, f1, f2, f3, p)
+
+    for field in gcat.GCIResult._fields:
+        assert getattr(result, field).shape == (2,)
+        assert getattr(result, field) == pytest.approx(
+            getattr(expected, field), rel=1e-12
+        )